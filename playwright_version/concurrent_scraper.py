@@ -7,7 +7,7 @@ import asyncio
 import os
 import time
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Callable, Awaitable
 import concurrent.futures
 from dataclasses import dataclass
 from datetime import datetime
@@ -16,7 +16,8 @@ from datetime import datetime
 SAVE_DEBUG_FILES = True
 OUTPUT_FOLDER = 'business_lookup_output'
 MAX_CONCURRENT_SEARCHES = 5  # Adjust based on your system and website limits
-BROWSER_POOL_SIZE = 3  # Number of browser instances to maintain
+BROWSER_POOL_SIZE = 3  # Number of browser instances for subclasses that pre-build context pools
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
 @dataclass
 class SearchResult:
@@ -38,6 +39,7 @@ class ConcurrentPlaywrightScraper:
         self.browser_pool_size = browser_pool_size
         self.headless = headless
         self.playwright = None
+        self.browser: Optional[Browser] = None  # Shared by every search task
         self.browser_pool: List[Browser] = []
         self.context_pool: List[BrowserContext] = []
         self.semaphore = asyncio.Semaphore(max_concurrent)
@@ -52,37 +54,37 @@ class ConcurrentPlaywrightScraper:
         await self.close()
     
     async def start(self):
-        """Initialize browser pool and contexts."""
+        """
+        Launch a single shared browser.
+        Each search opens its own lightweight context on it, so only one
+        Chromium launch is paid regardless of how many businesses are searched.
+        """
         self.playwright = await async_playwright().start()
         
-        # Create multiple browser instances for better isolation
-        for i in range(self.browser_pool_size):
-            browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-dev-shm-usage',
-                    '--disable-extensions',
-                    '--disable-gpu',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-background-networking',
-                    '--disable-default-apps',
-                    '--disable-sync',
-                ]
-            )
-            self.browser_pool.append(browser)
-            
-            # Create multiple contexts per browser
-            contexts_per_browser = max(1, self.max_concurrent // self.browser_pool_size)
-            for j in range(contexts_per_browser):
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
-                self.context_pool.append(context)
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--disable-dev-shm-usage',
+                '--disable-extensions',
+                '--disable-gpu',
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-web-security',
+                '--disable-background-networking',
+                '--disable-default-apps',
+                '--disable-sync',
+            ]
+        )
+        self.browser_pool.append(self.browser)
         
-        print(f"Initialized {len(self.browser_pool)} browsers with {len(self.context_pool)} contexts")
+        print(f"Initialized shared browser (max {self.max_concurrent} concurrent contexts)")
+    
+    async def _new_context(self) -> BrowserContext:
+        """Create an isolated context (own cookies/user agent) on the shared browser."""
+        return await self.browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=USER_AGENT
+        )
     
     async def close(self):
         """Close all browsers and contexts."""
@@ -114,10 +116,10 @@ class ConcurrentPlaywrightScraper:
         """
         start_time = time.time()
         
-        async with self.semaphore:  # Limit concurrent searches
+        async with self.semaphore:  # Limit concurrent searches (and open contexts)
             try:
-                # Get context from pool
-                context = self.context_pool[context_id % len(self.context_pool)]
+                # Per-task context on the shared browser
+                context = await self._new_context()
                 page = await context.new_page()
                 
                 try:
@@ -189,7 +191,7 @@ class ConcurrentPlaywrightScraper:
                     )
                 
                 finally:
-                    await page.close()
+                    await context.close()
                     
             except Exception as e:
                 search_time = time.time() - start_time
@@ -211,21 +213,19 @@ class ConcurrentPlaywrightScraper:
         while time.time() - start_time < max_wait:
             # Check if results are loaded
             try:
-                # Look for result containers
-                results = await page.query_selector_all("div.registerItemSearch-results-page-line-ItemBox")
-                if results:
+                # Look for result containers - count() returns one int instead
+                # of a handle per match
+                if await page.locator("div.registerItemSearch-results-page-line").count():
                     print("Results detected, stopping wait")
                     return
                 
                 # Check for "no results" message
-                no_results = await page.query_selector("text=/No results found|No matches found/i")
-                if no_results:
+                if await page.locator("text=/No results found|No matches found/i").count():
                     print("No results message detected")
                     return
                 
                 # Check if search is still processing
-                loading = await page.query_selector("text=/Loading|Searching|Please wait/i")
-                if not loading:
+                if not await page.locator("text=/Loading|Searching|Please wait/i").count():
                     # If no loading indicator and we've waited a bit, probably done
                     if time.time() - start_time > 3.0:
                         return
@@ -238,35 +238,47 @@ class ConcurrentPlaywrightScraper:
                     return
                 await asyncio.sleep(0.5)
     
-    async def search_multiple_businesses(self, business_names: List[str]) -> List[SearchResult]:
+    async def search_multiple_businesses(self, business_names: List[str],
+                                         on_result: Optional[Callable[[SearchResult], Awaitable[None]]] = None
+                                         ) -> List[SearchResult]:
         """
         Search multiple businesses concurrently.
+        A fixed set of max_concurrent workers drains a queue of names, so
+        memory and scheduler load stay flat however many names are given.
+        Results are returned in input order; on_result, if given, is awaited
+        with each result as soon as it completes so callers can stream them.
         """
         print(f"Starting concurrent search for {len(business_names)} businesses...")
-        print(f"Max concurrent: {self.max_concurrent}, Contexts: {len(self.context_pool)}")
+        print(f"Max concurrent: {self.max_concurrent}")
         
-        # Create tasks with context assignment
-        tasks = []
-        for i, business_name in enumerate(business_names):
-            context_id = i % len(self.context_pool)
-            task = self.search_business_optimized(business_name, context_id)
-            tasks.append(task)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(business_names):
+            queue.put_nowait(item)
         
-        # Execute all searches concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        search_results: List[Optional[SearchResult]] = [None] * len(business_names)
         
-        # Process results
-        search_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                search_results.append(SearchResult(
-                    business_name=business_names[i],
-                    html_content="",
-                    success=False,
-                    error_message=str(result)
-                ))
-            else:
-                search_results.append(result)
+        async def worker(worker_id: int):
+            while True:
+                try:
+                    i, business_name = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                try:
+                    search_results[i] = await self.search_business_optimized(business_name, worker_id)
+                except Exception as e:
+                    search_results[i] = SearchResult(
+                        business_name=business_name,
+                        html_content="",
+                        success=False,
+                        error_message=str(e)
+                    )
+                
+                if on_result is not None:
+                    await on_result(search_results[i])
+        
+        num_workers = min(self.max_concurrent, len(business_names))
+        await asyncio.gather(*(worker(worker_id) for worker_id in range(num_workers)))
         
         return search_results
 
@@ -300,15 +312,7 @@ def search_multiple_businesses_sync(business_names: List[str]) -> List[SearchRes
     """
     Synchronous wrapper for batch business search.
     """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            raise RuntimeError("Loop is closed")
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(batch_search_businesses(business_names))
+    return asyncio.run(batch_search_businesses(business_names))
 
 
 if __name__ == "__main__":
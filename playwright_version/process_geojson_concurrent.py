@@ -19,6 +19,8 @@ OUTPUT_FOLDER = 'business_lookup_output'
 BATCH_SIZE = 5   # Number of businesses to process concurrently (reduced for stability)
 MAX_CONCURRENT = 2  # Number of concurrent browser contexts (reduced for stability)
 
+_WORD_RE = re.compile(r'\w+')
+
 def ensure_output_folder():
     """Create the output folder if it doesn't exist."""
     if SAVE_DEBUG_FILES and not os.path.exists(OUTPUT_FOLDER):
@@ -32,17 +34,28 @@ def get_output_path(filename: str) -> str:
         return os.path.join(OUTPUT_FOLDER, filename)
     return filename
 
+def classify_owner(owner_name: str) -> Tuple[bool, str]:
+    """
+    Classify an owner name, upper-casing it only once.
+    Returns (is_private, owner_upper) so callers can reuse the upper-cased
+    name instead of converting it again.
+    """
+    if not owner_name or not isinstance(owner_name, str):
+        return False, ''
+    
+    owner_upper = owner_name.upper().strip()
+    return _is_private_upper(owner_upper), owner_upper
+
 def is_private_owner(owner_name: str) -> bool:
     """
     Check if the owner name should be processed.
     Returns True if the owner is a private individual (should be processed),
     False if it's a corporation (should be skipped).
     """
-    if not owner_name or not isinstance(owner_name, str):
-        return False
-    
-    owner_upper = owner_name.upper().strip()
-    
+    return classify_owner(owner_name)[0]
+
+def _is_private_upper(owner_upper: str) -> bool:
+    """Apply the private-owner rules to an already upper-cased, stripped name."""
     # Skip empty or very short names
     if len(owner_upper) < 3:
         return False
@@ -97,6 +110,7 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
         owners = set()
         corporate_owners = set()
         private_owners = set()
+        ltd_owners = set()  # Corporate owners excluded for LTD/LIMITED, tracked for the debug report
         
         features = data.get('features', [])
         if not features and isinstance(data, dict) and 'type' in data and data['type'] == 'Feature':
@@ -112,10 +126,13 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
             if not owner:
                 continue
                 
-            if is_private_owner(owner):
+            is_private, owner_upper = classify_owner(owner)
+            if is_private:
                 private_owners.add(owner)
             else:
                 corporate_owners.add(owner)
+                if debug and ('LTD' in owner_upper or 'LIMITED' in owner_upper):
+                    ltd_owners.add(owner)
         
         if debug:
             with open('filtered_owners.txt', 'w', encoding='utf-8') as f:
@@ -127,10 +144,7 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
                 f.write("=== EXCLUDED CORPORATE OWNERS ===\n\n")
                 f.write(f"Total excluded: {len(corporate_owners)}\n\n")
                 
-                exclusion_reasons = {
-                    'LTD/LIMITED': [o for o in corporate_owners 
-                                   if 'LTD' in o.upper() or 'LIMITED' in o.upper()]
-                }
+                exclusion_reasons = {'LTD/LIMITED': ltd_owners}
                 
                 for reason, owners_list in exclusion_reasons.items():
                     if owners_list:
@@ -275,8 +289,8 @@ def is_company_match(search_term: str, company_info: Dict[str, str]) -> Tuple[bo
         return False, "", 0.0
     
     # Normalize names for comparison
-    search_normalized = ' '.join(re.findall(r'\w+', search_term.lower()))
-    company_normalized = ' '.join(re.findall(r'\w+', company_name.lower()))
+    search_normalized = ' '.join(_WORD_RE.findall(search_term.lower()))
+    company_normalized = ' '.join(_WORD_RE.findall(company_name.lower()))
     
     # Direct match
     if search_normalized in company_normalized or company_normalized in search_normalized:
@@ -408,9 +422,9 @@ async def process_owners_concurrent(owners: Set[str], output_dir: str = 'owner_l
                         details_f.write("-" * 80 + "\n")
                         
                         # Generate normalized search and company name for debug info
-                        normalized_search = ' '.join(re.findall(r'\w+', owner.lower()))
+                        normalized_search = ' '.join(_WORD_RE.findall(owner.lower()))
                         company_name = company_info.get('COMPANY_NAME', '').lower()
-                        normalized_company = ' '.join(re.findall(r'\w+', company_name))
+                        normalized_company = ' '.join(_WORD_RE.findall(company_name))
                         
                         # Generate search variations
                         search_terms = normalized_search.split()
@@ -1,7 +1,10 @@
+import hashlib
 import json
 import os
-from typing import List, Dict, Set, Optional
-from business_lookup_playwright import search_ontario_business_playwright, extract_company_info, is_company_match, save_results
+import re
+from collections import OrderedDict
+from typing import List, Dict, Set, Optional, Tuple
+from business_lookup_playwright import search_ontario_business_playwright, extract_company_info, is_company_match, save_results, extract_company_details
 from tqdm import tqdm
 import time
 
@@ -9,6 +12,13 @@ import time
 SAVE_DEBUG_FILES = True  # Set to False to disable saving HTML and debug files
 OUTPUT_FOLDER = 'business_lookup_output'  # Folder name for organizing output files
 
+_WORD_RE = re.compile(r'\w+')
+
+# Registry pages are often identical across owner queries (e.g. "no results"),
+# so parsed company details are memoized by a digest of the raw HTML
+DETAIL_CACHE_SIZE = 256
+_detail_cache: 'OrderedDict[bytes, dict]' = OrderedDict()
+
 def ensure_output_folder():
     """Create the output folder if it doesn't exist."""
     if SAVE_DEBUG_FILES and not os.path.exists(OUTPUT_FOLDER):
@@ -22,17 +32,28 @@ def get_output_path(filename: str) -> str:
         return os.path.join(OUTPUT_FOLDER, filename)
     return filename
 
+def classify_owner(owner_name: str) -> Tuple[bool, str]:
+    """
+    Classify an owner name, upper-casing it only once.
+    Returns (is_private, owner_upper) so callers can reuse the upper-cased
+    name instead of converting it again.
+    """
+    if not owner_name or not isinstance(owner_name, str):
+        return False, ''  # Skip invalid entries
+    
+    owner_upper = owner_name.upper().strip()
+    return _is_private_upper(owner_upper, owner_name), owner_upper
+
 def is_private_owner(owner_name: str) -> bool:
     """
     Check if the owner name should be processed.
     Returns True if the owner is a private individual (should be processed),
     False if it's a corporation (should be skipped).
     """
-    if not owner_name or not isinstance(owner_name, str):
-        return False  # Skip invalid entries
-    
-    owner_upper = owner_name.upper().strip()
-    
+    return classify_owner(owner_name)[0]
+
+def _is_private_upper(owner_upper: str, owner_name: str) -> bool:
+    """Apply the private-owner rules to an already upper-cased, stripped name."""
     # Skip empty or very short names
     # if len(owner_upper) < 3:
     #     return False
@@ -114,6 +135,7 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
         owners = set()
         corporate_owners = set()
         private_owners = set()
+        ltd_owners = set()  # Corporate owners excluded for LTD/LIMITED, tracked for the debug report
         
         # Handle both FeatureCollection and single Feature
         features = data.get('features', [])
@@ -130,10 +152,13 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
             if not owner:
                 continue
                 
-            if is_private_owner(owner):
+            is_private, owner_upper = classify_owner(owner)
+            if is_private:
                 private_owners.add(owner)
             else:
                 corporate_owners.add(owner)
+                if debug and ('LTD' in owner_upper or 'LIMITED' in owner_upper):
+                    ltd_owners.add(owner)
         
         # Debug: Save filtered and excluded owners to files
         if debug:
@@ -150,10 +175,7 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
                 f.write(f"Total excluded: {len(corporate_owners)}\n\n")
                 
                 # Only group by 'LTD/LIMITED' exclusion reason
-                exclusion_reasons = {
-                    'LTD/LIMITED': [o for o in corporate_owners 
-                                   if 'LTD' in o.upper() or 'LIMITED' in o.upper()]
-                }
+                exclusion_reasons = {'LTD/LIMITED': ltd_owners}
                 # Write each category
                 for reason, owners_list in exclusion_reasons.items():
                     if owners_list:
@@ -171,6 +193,19 @@ def extract_owners_from_geojson(geojson_path: str, debug: bool = False) -> Set[s
         print(f"Error processing GeoJSON file: {e}")
         return set()
 
+def get_company_details_cached(raw_html: str) -> dict:
+    """Return extract_company_details(raw_html), reusing results for identical pages."""
+    key = hashlib.blake2b(raw_html.encode('utf-8'), digest_size=16).digest()
+    details = _detail_cache.get(key)
+    if details is None:
+        details = extract_company_details(raw_html)
+        _detail_cache[key] = details
+        if len(_detail_cache) > DETAIL_CACHE_SIZE:
+            _detail_cache.popitem(last=False)
+    else:
+        _detail_cache.move_to_end(key)
+    return details
+
 def process_owners(owners: Set[str], output_dir: str = 'owner_lookups_playwright') -> Dict[str, Dict]:
     """Process a list of owners and perform business lookups using Playwright."""
     # Use the configured output folder if saving debug files is enabled
@@ -258,8 +293,7 @@ def process_owners(owners: Set[str], output_dir: str = 'owner_lookups_playwright
                 # Extract additional details from HTML if available
                 raw_html = company_info.get('_raw_html', '')
                 if raw_html:
-                    from business_lookup_playwright import extract_company_details
-                    details = extract_company_details(raw_html)
+                    details = get_company_details_cached(raw_html)
                     company_info.update(details)
                 
                 # Define the order of fields we want to display
@@ -281,10 +315,9 @@ def process_owners(owners: Set[str], output_dir: str = 'owner_lookups_playwright
                     details_f.write("-" * 80 + "\n")
                     
                     # Generate normalized search and company name for debug info
-                    import re
-                    normalized_search = ' '.join(re.findall(r'\w+', owner.lower()))
+                    normalized_search = ' '.join(_WORD_RE.findall(owner.lower()))
                     company_name = company_info.get('COMPANY NAME', '').lower()
-                    normalized_company = ' '.join(re.findall(r'\w+', company_name))
+                    normalized_company = ' '.join(_WORD_RE.findall(company_name))
                     
                     # Generate search variations
                     search_terms = normalized_search.split()
@@ -305,8 +338,9 @@ def process_owners(owners: Set[str], output_dir: str = 'owner_lookups_playwright
                     details_f.write(f"Search variations: {variations}\n")
                     
                     # Check for direct match
-                    if any(variation in normalized_company for variation in variations):
-                        details_f.write(f"✅ Direct match found with variations: {[v for v in variations if v in normalized_company]}\n")
+                    matching_variations = [v for v in variations if v in normalized_company]
+                    if matching_variations:
+                        details_f.write(f"✅ Direct match found with variations: {matching_variations}\n")
                     else:
                         details_f.write("❌ No direct match found in variations\n")
                     
@@ -1,6 +1,22 @@
 import re
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+# Matches "Key: Value" lines inside a result block (surrounding whitespace ignored)
+_KV_RE = re.compile(r'^[^\S\n]*(.*?): (.*\S)[^\S\n]*$', re.MULTILINE)
+
+# Below this many blocks, worker start-up costs more than the parse itself
+PARALLEL_PARSE_THRESHOLD = 2000
+
+def _parse_block(block: str) -> dict:
+    """Parse a single result block into a dictionary of its key/value lines."""
+    return dict(_KV_RE.findall(block))
 
 def parse_report_to_json(file_path):
     """
@@ -36,27 +52,27 @@ def parse_report_to_json(file_path):
     unique_blocks = list(set(cleaned_blocks))
     print(f"Unique blocks after deduplication: {len(unique_blocks)}")
 
-    # Parse into dictionaries
-    data_list = []
-    for block in unique_blocks:
-        entry = {}
-        lines = block.split('\n')
-        for line in lines:
-            line = line.strip()
-            if ": " in line:
-                key, value = line.split(": ", 1)
-                entry[key] = value
-        
-        if entry:
-            data_list.append(entry)
+    # Parse into dictionaries, spreading large reports across worker processes
+    if len(unique_blocks) >= PARALLEL_PARSE_THRESHOLD:
+        with ProcessPoolExecutor() as executor:
+            parsed = executor.map(_parse_block, unique_blocks, chunksize=256)
+            data_list = [entry for entry in parsed if entry]
+    else:
+        data_list = [entry for entry in map(_parse_block, unique_blocks) if entry]
 
     # Sort by Business Name for consistency
     data_list.sort(key=lambda x: x.get("Business Name", ""))
 
     # Output to JSON
     output_path = os.path.join(os.path.dirname(file_path), 'non_profit_data2.json')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
+    # Serialize in one call and write the buffer once instead of streaming
+    # many small writes through json.dump
+    if orjson is not None:
+        buf = orjson.dumps(data_list, option=orjson.OPT_INDENT_2)
+    else:
+        buf = json.dumps(data_list, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(output_path, 'wb') as f:
+        f.write(buf)
 
     print(f"Successfully saved {len(data_list)} unique records to: {output_path}")
     return output_path
@@ -5,24 +5,113 @@ OPTIMIZED VERSION with concurrent capabilities and performance improvements.
 """
 
 import asyncio
+import atexit
+import json
 import os
+import random
+import sys
+import threading
 import time
+from contextlib import asynccontextmanager, suppress
+from urllib.parse import urlsplit
+
+import aiofiles
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-from typing import Optional, List, Dict
+from playwright.async_api import Error as PlaywrightError
+from typing import Optional, List, Dict, Union
 import concurrent.futures
 from dataclasses import dataclass
 
+# Run the event loops created here on uvloop when it is installed (not on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+if uvloop is not None and sys.platform != 'win32':
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    _new_event_loop = uvloop.new_event_loop
+else:
+    _new_event_loop = asyncio.new_event_loop
+
 # Configuration - Set these to control file output behavior
 SAVE_DEBUG_FILES = True  # Set to False to disable saving HTML and debug files
 OUTPUT_FOLDER = 'business_lookup_output'  # Folder name for organizing output files
+SEARCH_URL = "https://www.appmybizaccount.gov.on.ca/onbis/master/viewInstance/view.pub?id=3abd3bce3cc0ad2a5f4d3e3394f70a887b5d3629f9b7ec72&_timestamp=576646948208925"  # Ontario Business Registry search page
 MAX_CONCURRENT_SEARCHES = 3  # Number of concurrent searches (be respectful to server)
+SEARCH_RATE = 2.0  # Searches started per second, at most (be respectful to server)
+SEARCH_BURST = 3  # Searches that may start back-to-back before SEARCH_RATE applies
 OPTIMIZED_TIMEOUTS = True  # Use shorter, smarter timeouts
+BLOCK_HEAVY_RESOURCES = True  # Skip images/fonts/media/CSS - only the DOM text is scraped
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+BLOCKED_HOSTS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net')  # Trackers (and subdomains)
+
+# Selector unions resolved in a single locator query instead of one round-trip each
+SEARCH_BUTTON_CSS = ",".join([
+    "button[type='submit']",
+    "input[type='submit']",
+    "button:has-text('Search')",
+    "button:has-text('SEARCH')",
+    "input[value='Search']",
+    "input[value='SEARCH']",
+    "#nodeW20",  # Original ID as fallback
+])
+RESULT_ROW_CSS = "div.registerItemSearch-results-page-line"  # One per search hit
+RESULT_CSS = ",".join([
+    RESULT_ROW_CSS,
+    "div.registerItemSearch-results-page-line-ItemBox",
+    "div.search-results",
+    "div.result-item",
+    "div.search-result",
+])
+
+# Pulls the fields extract_company_info needs out of each result row in-page,
+# so only a few KB of JSON cross the wire instead of the whole page
+EXTRACT_RESULTS_JS = """
+rows => rows.map(row => {
+    const text = sel => {
+        const el = row.querySelector(sel);
+        return el ? el.innerText.trim() : null;
+    };
+    return {
+        name: text('a.registerItemSearch-results-page-line-ItemBox-resultLeft-viewMenu'),
+        registry: text('.registryInfo'),
+        address: text('.ItemAddress .appAttrValue'),
+        status: text('.Status .appMinimalValue'),
+        registration_date: text('.RegistrationDate .appMinimalValue'),
+        business_type: text('.EntitySubTypeCode .appMinimalValue')
+    };
+})
+"""
+
+# Installed in every page so one evaluate() reports both the result count and
+# the no-results message; the regex is compiled once per document
+SCAN_RESULTS_SCRIPT = """
+window.__scanResults = () => {
+    const text = (document.body && document.body.innerText) || '';
+    return {
+        results: document.querySelectorAll(%s).length,
+        none: /No (results|matches) found/i.test(text)
+    };
+};
+""" % json.dumps(RESULT_CSS)
+
+# Shared Playwright driver and browsers, launched once per event loop and reused
+# by every PlaywrightScraper so each search does not pay a Chromium cold start.
+# Playwright objects only work on the loop that created them, so each loop owns
+# its own set and must close it (close_shared_browser) before the loop exits.
+_SHARED: Dict[asyncio.AbstractEventLoop, '_SharedDriver'] = {}
+_SHARED_LOCK = threading.Lock()  # loops on different threads register concurrently
+_RUNNER: Optional[asyncio.Runner] = None  # long-lived loop behind the sync wrappers
+
+_OUTPUT_READY = False  # set once OUTPUT_FOLDER is known to exist
 
 def ensure_output_folder():
-    """Create the output folder if it doesn't exist."""
-    if SAVE_DEBUG_FILES and not os.path.exists(OUTPUT_FOLDER):
-        os.makedirs(OUTPUT_FOLDER)
-        print(f"Created output folder: {OUTPUT_FOLDER}")
+    """Create the output folder if it doesn't exist (checked once per process)."""
+    global _OUTPUT_READY
+    if _OUTPUT_READY or not SAVE_DEBUG_FILES:
+        return
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    _OUTPUT_READY = True
 
 def get_output_path(filename: str) -> str:
     """Get the full path for an output file."""
@@ -31,15 +120,304 @@ def get_output_path(filename: str) -> str:
         return os.path.join(OUTPUT_FOLDER, filename)
     return filename
 
+class _SharedDriver:
+    """Playwright driver, browsers and context pools owned by one event loop."""
+    
+    def __init__(self):
+        self.playwright = None
+        self.browsers: Dict[tuple, Browser] = {}  # keyed by (headless, slow_mo)
+        self.context_pools: Dict[tuple, 'ContextPool'] = {}  # warm contexts per shared browser
+        self.lock = asyncio.Lock()
+    
+    async def close(self):
+        """Close every browser and stop the driver."""
+        self.context_pools.clear()
+        for browser in list(self.browsers.values()):
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Error closing shared browser: {e}")
+        self.browsers.clear()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+def _shared_driver() -> _SharedDriver:
+    """Return the running loop's shared Playwright state, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _SHARED_LOCK:
+        shared = _SHARED.get(loop)
+        if shared is None:
+            for stale in [l for l in _SHARED if l.is_closed()]:
+                # Its driver and Chromium can no longer be shut down from Python
+                print("Warning: a shared Playwright browser outlived its event loop; "
+                      "await close_shared_browser() before the loop exits")
+                del _SHARED[stale]
+            shared = _SHARED[loop] = _SharedDriver()
+        return shared
+
+async def get_playwright():
+    """Return the running loop's Playwright driver, starting it on first use."""
+    shared = _shared_driver()
+    async with shared.lock:
+        if shared.playwright is None:
+            shared.playwright = await async_playwright().start()
+        return shared.playwright
+
+async def _get_browser(headless: bool = True, slow_mo: int = 0) -> Browser:
+    """Return the shared browser for these launch options, launching it on first use."""
+    playwright = await get_playwright()
+    shared = _shared_driver()
+    
+    async with shared.lock:
+        key = (headless, slow_mo)
+        browser = shared.browsers.get(key)
+        if browser is None or not browser.is_connected():
+            browser = await playwright.chromium.launch(
+                headless=headless,
+                slow_mo=slow_mo,
+                args=[
+                    '--disable-dev-shm-usage',
+                    '--disable-extensions',
+                    '--disable-gpu',
+                    '--no-sandbox',
+                    '--disable-setuid-sandbox',
+                    '--disable-web-security',
+                ]
+            )
+            shared.browsers[key] = browser
+        return browser
+
+async def close_shared_browser():
+    """Close the running loop's shared browsers and stop its Playwright driver."""
+    with _SHARED_LOCK:
+        shared = _SHARED.pop(asyncio.get_running_loop(), None)
+    if shared is not None:
+        await shared.close()
+
+def _is_blocked_host(url: str) -> bool:
+    """Whether a request URL points at one of BLOCKED_HOSTS or a subdomain of it."""
+    host = urlsplit(url).hostname or ''
+    return any(host == blocked or host.endswith('.' + blocked) for blocked in BLOCKED_HOSTS)
+
+async def _block_heavy_resources(route):
+    """Abort requests for resource types and tracker hosts the scraper never reads."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _new_context(browser: Browser, storage_state: Optional[dict] = None) -> BrowserContext:
+    """
+    Create a browser context with the scraper's viewport, user agent and routing.
+    Pass storage_state to start from cookies saved in another context.
+    """
+    context = await browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        extra_http_headers={'Referer': SEARCH_URL},
+        storage_state=storage_state
+    )
+    
+    # Fewer requests in flight also lets the page go quiet much sooner
+    if BLOCK_HEAVY_RESOURCES:
+        await context.route("**/*", _block_heavy_resources)
+    await context.add_init_script(SCAN_RESULTS_SCRIPT)
+    
+    return context
+
+@asynccontextmanager
+async def _wait_quiet(page: Page, quiet_ms: int = 1500, timeout_ms: int = 15000):
+    """
+    Track the page's requests for the duration of the block, then wait until
+    none have been in flight for quiet_ms.
+    
+    Wrap a 'domcontentloaded' goto in it instead of using 'networkidle', which
+    can sit out its whole timeout on pages holding connections open. Listeners
+    go on before navigation so requests started during the load are counted.
+    Returns quietly once timeout_ms has passed.
+    """
+    pending = set()
+    
+    def on_request(request):
+        pending.add(request)
+    
+    def on_done(request):
+        pending.discard(request)
+    
+    page.on('request', on_request)
+    page.on('requestfinished', on_done)
+    page.on('requestfailed', on_done)
+    try:
+        yield
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        idle_start = loop.time()
+        while loop.time() < deadline:
+            await asyncio.sleep(0.1)
+            now = loop.time()
+            if pending:
+                idle_start = now
+            elif now - idle_start >= quiet_ms / 1000:
+                return
+    finally:
+        page.remove_listener('request', on_request)
+        page.remove_listener('requestfinished', on_done)
+        page.remove_listener('requestfailed', on_done)
+
+def _configure_page(page: Page):
+    """Apply the module's default timeouts to a page."""
+    if OPTIMIZED_TIMEOUTS:
+        page.set_default_timeout(15000)  # 15 seconds - faster failure detection
+        page.set_default_navigation_timeout(30000)  # 30 seconds
+    else:
+        page.set_default_timeout(30000)  # 30 seconds
+        page.set_default_navigation_timeout(60000)  # 60 seconds
+
+class ContextPool:
+    """
+    Bounded pool of warm browser contexts reused across searches.
+    
+    Contexts are created lazily up to `size` and keep their cookies between
+    uses. Once the registry's cookie banner has been dismissed in one context,
+    its storage state is captured and every context created afterwards starts
+    with the banner already accepted.
+    """
+    
+    def __init__(self, browser: Browser, size: int = MAX_CONCURRENT_SEARCHES):
+        self.browser = browser
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._cookies_accepted = set()
+        self._storage_state: Optional[dict] = None  # cookies from the first accepted banner
+    
+    async def acquire(self) -> BrowserContext:
+        """Take an idle context, creating one if the pool is not yet full."""
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            try:
+                context = await _new_context(self.browser, self._storage_state)
+            except Exception:
+                self._created -= 1
+                raise
+            if self._storage_state is not None:
+                self._cookies_accepted.add(context)
+            return context
+        return await self._idle.get()
+    
+    def release(self, context: BrowserContext):
+        """Return a context to the pool."""
+        self._idle.put_nowait(context)
+    
+    def cookies_accepted(self, context: BrowserContext) -> bool:
+        """Whether the cookie banner has already been handled in this context."""
+        return context in self._cookies_accepted
+    
+    async def mark_cookies_accepted(self, context: BrowserContext):
+        """Record that this context no longer needs the cookie banner handled."""
+        self._cookies_accepted.add(context)
+        if self._storage_state is None:
+            self._storage_state = await context.storage_state()
+    
+    async def close(self):
+        """Close every idle context and empty the pool."""
+        while not self._idle.empty():
+            context = self._idle.get_nowait()
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"Error closing pooled context: {e}")
+        self._created = 0
+        self._cookies_accepted.clear()
+        self._storage_state = None
+
+async def _get_context_pool(headless: bool = True) -> ContextPool:
+    """Return the context pool for the shared browser with these launch options."""
+    browser = await _get_browser(headless)
+    pools = _shared_driver().context_pools
+    pool = pools.get((headless, 0))
+    if pool is None or pool.browser is not browser:
+        pool = ContextPool(browser)
+        pools[(headless, 0)] = pool
+    return pool
+
+@atexit.register
+def _close_shared_browser_at_exit():
+    """Best-effort cleanup of browsers whose loop is still usable at interpreter exit."""
+    for loop in list(_SHARED):
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(close_shared_browser())
+    if _RUNNER is not None:
+        _RUNNER.close()
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Uses one asyncio.Runner for the life of the program rather than asyncio.run
+    per call, so the shared browser and warm contexts survive between searches.
+    """
+    global _RUNNER
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if _RUNNER is None:
+            _RUNNER = asyncio.Runner(loop_factory=_new_event_loop)
+        return _RUNNER.run(coro)
+    
+    # Called from inside a running loop (e.g. Jupyter): nest into it. nest_asyncio
+    # can only patch the pure-Python loop, not uvloop's
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, asyncio.BaseEventLoop):
+        coro.close()
+        raise RuntimeError(
+            f"a synchronous wrapper can't run inside a {type(loop).__name__} event loop; "
+            "await the async API (e.g. search_ontario_business_async) instead"
+        )
+    import nest_asyncio
+    nest_asyncio.apply(loop)
+    return loop.run_until_complete(coro)
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+    
+    Allows `rate` acquisitions per second on average with bursts of up to
+    `capacity`; a caller only waits when the bucket is actually empty.
+    """
+    
+    def __init__(self, rate: float = SEARCH_RATE, capacity: int = SEARCH_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Take one token, sleeping until one is available."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 @dataclass
 class SearchResult:
     """Data class for search results with performance metrics."""
     business_name: str
-    html_content: str
+    html_content: Union[str, bytes]  # UTF-8 bytes from search_business_optimized
     success: bool
     error_message: str = ""
     search_time: float = 0.0
-    response_size: int = 0
+    response_size: int = 0  # bytes
+    results: Optional[List[dict]] = None  # one dict per result row, see extract_results
 
 
 class PlaywrightScraper:
@@ -59,6 +437,7 @@ class PlaywrightScraper:
         self.browser = None
         self.context = None
         self.page = None
+        self.cookies_accepted = False  # set once the cookie banner has been clicked
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -74,60 +453,31 @@ class PlaywrightScraper:
         await self.start()
     
     async def start(self):
-        """Start the browser and create a new page."""
-        self.playwright = await async_playwright().start()
-        
-        # Launch Chromium browser
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=self.slow_mo,
-            args=[
-                '--disable-dev-shm-usage',
-                '--disable-extensions',
-                '--disable-gpu',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-            ]
-        )
-        
-        # Create browser context
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        """Attach to the shared browser and create a new context and page."""
+        # Reuse the module-wide Chromium instead of launching one per scraper
+        self.browser = await _get_browser(self.headless, self.slow_mo)
         
-        # Create new page
+        # Create browser context and page
+        self.context = await _new_context(self.browser)
         self.page = await self.context.new_page()
-        
-        # Set optimized timeouts
-        if OPTIMIZED_TIMEOUTS:
-            self.page.set_default_timeout(15000)  # 15 seconds - faster failure detection
-            self.page.set_default_navigation_timeout(30000)  # 30 seconds
-        else:
-            self.page.set_default_timeout(30000)  # 30 seconds
-            self.page.set_default_navigation_timeout(60000)  # 60 seconds
+        _configure_page(self.page)
         
         return self
     
     async def close(self):
-        """Close the browser and cleanup resources."""
+        """Close this scraper's page and context; the shared browser stays up."""
         if self.page:
             await self.page.close()
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
     
-    async def get_page(self, url: str, wait_time: float = 3.0) -> str:
+    async def get_page(self, url: str, wait_time: float = 0.0) -> str:
         """
         Navigate to a URL and return the page content.
         
         Args:
             url: URL to navigate to
-            wait_time: Time to wait after page load
+            wait_time: Extra time to wait after the network goes quiet (none by default)
             
         Returns:
             Page HTML content as string
@@ -135,11 +485,13 @@ class PlaywrightScraper:
         try:
             print(f"Navigating to: {url}")
             
-            # Navigate to the URL
-            await self.page.goto(url, wait_until='networkidle')
+            # Navigate to the URL, then let late requests settle
+            async with _wait_quiet(self.page):
+                await self.page.goto(url, wait_until='domcontentloaded')
             
-            # Wait for the page to stabilize
-            await asyncio.sleep(wait_time)
+            # Only sleep when the caller explicitly asks for extra settle time
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
             
             # Return page content
             content = await self.page.content()
@@ -234,124 +586,155 @@ class PlaywrightScraper:
         except Exception as e:
             print(f"Error taking screenshot: {e}")
     
-    async def search_business_optimized(self, business_name: str) -> SearchResult:
+    async def search_business_optimized(self, business_name: str, handle_cookies: bool = True,
+                                        max_retries: int = 3,
+                                        include_html: Optional[bool] = None) -> SearchResult:
         """
         Optimized business search with performance improvements.
+        Playwright errors (timeouts, failed navigations) are retried with
+        exponential backoff; anything else fails immediately.
         
         Args:
             business_name: Name of the business to search for
+            handle_cookies: Whether to look for the cookie banner first
+            max_retries: Total attempts before giving up
+            include_html: Also return the full page HTML (defaults to SAVE_DEBUG_FILES)
             
         Returns:
             SearchResult with performance metrics
         """
         start_time = time.time()
         
-        try:
-            print(f"Optimized search for: {business_name}")
-            
-            # Navigate with faster load strategy
-            search_url = "https://www.appmybizaccount.gov.on.ca/onbis/master/viewInstance/view.pub?id=3abd3bce3cc0ad2a5f4d3e3394f70a887b5d3629f9b7ec72&_timestamp=576646948208925"
-            
-            await self.page.goto(search_url, wait_until='domcontentloaded')  # Faster than networkidle
-            
-            # Quick cookie handling with timeout
+        print(f"Optimized search for: {business_name}")
+        
+        max_retries = max(1, max_retries)  # Always make at least one attempt
+        for attempt in range(1, max_retries + 1):
             try:
-                await self.page.click("button:has-text('Accept all')", timeout=2000)
-                await asyncio.sleep(0.3)  # Reduced wait time
-            except:
-                pass  # Cookie banner might not exist
-            
-            # Fill search box with error handling
-            await self.page.wait_for_selector("#QueryString", timeout=10000)
-            await self.page.fill("#QueryString", business_name)
-            
-            # Try different search button selectors (same as original)
-            search_button_selectors = [
-                "button[type='submit']",
-                "input[type='submit']",
-                "button:has-text('Search')",
-                "button:has-text('SEARCH')",
-                "input[value='Search']",
-                "input[value='SEARCH']",
-                "#nodeW20"  # Original ID as fallback
-            ]
-            
-            search_clicked = False
-            for selector in search_button_selectors:
+                # Navigate with faster load strategy
+                await self.page.goto(SEARCH_URL, wait_until='domcontentloaded')  # Faster than networkidle
+                
+                # Quick cookie handling with timeout - skipped when the context already
+                # accepted them, and overlapped with waiting for the search box
+                cookie_task = asyncio.create_task(self._accept_cookies()) if handle_cookies else None
                 try:
-                    button = self.page.locator(selector)
-                    if await button.count() > 0:
-                        await button.click(timeout=5000)
-                        print(f"Search button clicked using {selector}")
-                        search_clicked = True
-                        break
-                except Exception as e:
-                    continue
-            
-            if not search_clicked:
-                raise Exception("Could not find or click the search button")
-            
-            # Wait for page to load after clicking
-            await self.page.wait_for_load_state('domcontentloaded')
-            
-            # Smart wait for results instead of fixed delay
-            await self._smart_wait_for_results()
-            
-            # Get page content
-            html_content = await self.page.content()
-            search_time = time.time() - start_time
-            
-            return SearchResult(
-                business_name=business_name,
-                html_content=html_content,
-                success=True,
-                search_time=search_time,
-                response_size=len(html_content)
-            )
-            
-        except Exception as e:
-            search_time = time.time() - start_time
-            print(f"Error in optimized search for {business_name}: {e}")
-            return SearchResult(
-                business_name=business_name,
-                html_content="",
-                success=False,
-                error_message=str(e),
-                search_time=search_time
-            )
+                    await self.page.wait_for_selector("#QueryString", timeout=10000)
+                except Exception:
+                    if cookie_task:
+                        # Reap the task so it is neither left pending nor drops its error
+                        cookie_task.cancel()
+                        with suppress(asyncio.CancelledError, PlaywrightError):
+                            await cookie_task
+                    raise
+                if cookie_task:
+                    await cookie_task  # Banner must be gone before the search button is clicked
+                
+                # Fill search box with error handling
+                await self.page.fill("#QueryString", business_name)
+                
+                # Click whichever search button variant the page has (one locator query)
+                # Kept a PlaywrightError so a transient click timeout is retried
+                try:
+                    await self.page.locator(SEARCH_BUTTON_CSS).first.click(timeout=5000)
+                except PlaywrightError as e:
+                    raise PlaywrightError(f"Could not find or click the search button: {e.message}") from e
+                
+                # Wait for page to load after clicking
+                await self.page.wait_for_load_state('domcontentloaded')
+                
+                # Smart wait for results instead of fixed delay
+                await self._smart_wait_for_results()
+                
+                # Structured rows are all callers need; the full page is debug-only
+                results = await self.extract_results()
+                if SAVE_DEBUG_FILES if include_html is None else include_html:
+                    # Encoded once so writers need no re-encode
+                    html_bytes = (await self.page.content()).encode('utf-8')
+                else:
+                    html_bytes = b""
+                search_time = time.time() - start_time
+                
+                return SearchResult(
+                    business_name=business_name,
+                    html_content=html_bytes,
+                    success=True,
+                    search_time=search_time,
+                    response_size=len(html_bytes),
+                    results=results
+                )
+                
+            except PlaywrightError as e:
+                error = e
+                if attempt == max_retries:
+                    break
+                delay = (2 ** (attempt - 1)) * 0.5 + random.random() * 0.2
+                print(f"Attempt {attempt} for {business_name} failed: {e} - retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                error = e
+                break
+        
+        search_time = time.time() - start_time
+        print(f"Error in optimized search for {business_name}: {error}")
+        return SearchResult(
+            business_name=business_name,
+            html_content=b"",
+            success=False,
+            error_message=str(error),
+            search_time=search_time
+        )
+    
+    async def extract_results(self) -> List[dict]:
+        """
+        Extract the current search results page as a list of dicts.
+        
+        Returns:
+            One dict per result row with name, registry, address, status,
+            registration_date and business_type (None when a field is missing)
+        """
+        return await self.page.locator(RESULT_ROW_CSS).evaluate_all(EXTRACT_RESULTS_JS)
+    
+    async def _accept_cookies(self):
+        """Click the cookie banner's accept button if it shows up within 2s."""
+        try:
+            await self.page.click("button:has-text('Accept all')", timeout=2000)
+            self.cookies_accepted = True
+        except Exception:
+            pass  # Cookie banner might not exist
     
     async def _smart_wait_for_results(self, max_wait: float = 6.0):
         """
         Smart waiting that checks for actual content instead of fixed delays.
-        Significantly faster than the original 10-second wait.
+        Returns as soon as results or a no-results message appear (checked
+        in-page by wait_for_function), or after 2s once no loading indicator
+        is showing - or when max_wait runs out.
         """
-        start_time = time.time()
+        timeout_ms = max_wait * 1000
         
-        while time.time() - start_time < max_wait:
-            try:
-                # Check for results
-                results = await self.page.query_selector_all("div.registerItemSearch-results-page-line-ItemBox")
-                if results:
-                    return  # Results found
-                
-                # Check for no results message
-                no_results = await self.page.query_selector("text=/No results found|No matches found/i")
-                if no_results:
-                    return  # No results confirmed
-                
-                # If we've waited minimum time and no loading indicators, assume done
-                if time.time() - start_time > 2.0:
-                    loading_indicators = await self.page.query_selector("text=/Loading|Searching|Please wait/i")
-                    if not loading_indicators:
-                        return
-                
-                await asyncio.sleep(0.3)  # Check every 300ms
-                
-            except Exception:
-                # If checking fails, use minimum wait time
-                if time.time() - start_time > 2.0:
+        async def loading_finished():
+            # Same grace period the old polling loop gave before giving up on results
+            await asyncio.sleep(2.0)
+            await self.page.wait_for_selector("text=/Loading|Searching|Please wait/i",
+                                              state='hidden', timeout=timeout_ms)
+        
+        pending = {
+            asyncio.create_task(self.page.wait_for_function(
+                "() => { const s = window.__scanResults && window.__scanResults(); "
+                "return !!s && (s.results > 0 || s.none); }",
+                timeout=timeout_ms)),
+            asyncio.create_task(loading_finished()),
+            asyncio.create_task(asyncio.sleep(max_wait)),
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A wait that errored out (e.g. mid-navigation) doesn't count as ready
+                errors = [task.exception() for task in done]
+                if not all(errors):
                     return
-                await asyncio.sleep(0.3)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
     
     async def search_multiple_concurrent(self, business_names: List[str]) -> List[SearchResult]:
         """
@@ -365,13 +748,12 @@ class PlaywrightScraper:
             List of SearchResult objects
         """
         results = []
+        bucket = TokenBucket()  # Be respectful without a fixed pause after every search
         
         for business_name in business_names:
+            await bucket.acquire()
             result = await self.search_business_optimized(business_name)
             results.append(result)
-            
-            # Brief pause between searches to be respectful
-            await asyncio.sleep(0.5)
         
         return results
 
@@ -392,7 +774,9 @@ class WebScraperPlaywright:
         """
         self.headless = headless
         self._scraper = None
-        self._loop = None
+        self._loop = None  # runs forever on _thread while the scraper is open
+        self._thread = None
+        self._cached_source: Optional[str] = None  # content as of the last navigation
     
     def __enter__(self):
         """Context manager entry."""
@@ -402,16 +786,17 @@ class WebScraperPlaywright:
         """Context manager exit."""
         self.close()
     
-    def _get_or_create_loop(self):
-        """Get or create an event loop."""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                raise RuntimeError("Loop is closed")
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop
+    def _ensure_loop(self):
+        """Start this wrapper's event loop on a background thread if it isn't running."""
+        if self._loop is None:
+            self._loop = _new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever,
+                                            name="WebScraperPlaywright-loop", daemon=True)
+            self._thread.start()
+    
+    def _run(self, coro):
+        """Run a coroutine on the background loop and block for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
     
     async def _start_scraper(self):
         """Start the async scraper."""
@@ -420,16 +805,16 @@ class WebScraperPlaywright:
     
     def start(self):
         """Start the scraper synchronously."""
-        self._loop = self._get_or_create_loop()
-        self._loop.run_until_complete(self._start_scraper())
+        self._ensure_loop()
+        self._run(self._start_scraper())
     
-    def get_page(self, url: str, wait_time: float = 3.0) -> str:
+    def get_page(self, url: str, wait_time: float = 0.0) -> str:
         """
         Navigate to a URL and return the page content (synchronous).
         
         Args:
             url: URL to navigate to
-            wait_time: Time to wait after page load
+            wait_time: Extra time to wait after the network goes quiet (none by default)
             
         Returns:
             Page HTML content as string
@@ -437,22 +822,39 @@ class WebScraperPlaywright:
         if not self._scraper:
             self.start()
         
-        return self._loop.run_until_complete(
-            self._scraper.get_page(url, wait_time)
-        )
+        result = self._run(self._scraper.get_page(url, wait_time))
+        self._cached_source = result
+        return result
+    
+    def _invalidate(self):
+        """Drop the cached page source; call after anything that may change the DOM."""
+        self._cached_source = None
     
     def close(self):
         """Close the scraper synchronously."""
-        if self._scraper and self._loop:
-            self._loop.run_until_complete(self._scraper.close())
+        self._invalidate()
+        if self._loop is None:
+            return
+        if self._scraper:
+            self._run(self._scraper.close())
             self._scraper = None
+        # The shared browser can't outlive the loop it was launched on
+        self._run(close_shared_browser())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
     
     # Compatibility properties for Selenium-like interface
     @property
     def page_source(self) -> str:
         """Get current page source (compatibility property)."""
+        if self._cached_source is not None:
+            return self._cached_source
         if self._scraper and self._scraper.page:
-            return self._loop.run_until_complete(self._scraper.page.content())
+            self._cached_source = self._run(self._scraper.page.content())
+            return self._cached_source
         return ""
 
 
@@ -467,109 +869,107 @@ async def search_ontario_business_async(business_name: str) -> str:
     Returns:
         HTML content of the search results page
     """
-    async with PlaywrightScraper(headless=False) as scraper:  # Set to True in production
-        try:
-            # Navigate to the search page
-            print(f"Searching for: {business_name}")
-            search_url = "https://www.appmybizaccount.gov.on.ca/onbis/master/viewInstance/view.pub?id=3abd3bce3cc0ad2a5f4d3e3394f70a887b5d3629f9b7ec72&_timestamp=576646948208925"
-            print(f"Accessing: {search_url}")
-            
-            await scraper.page.goto(search_url, wait_until='networkidle')
-            await asyncio.sleep(3)
-            
-            # Try to accept cookies if banner appears
+    pool = await _get_context_pool(headless=False)  # Set to True in production
+    context = await pool.acquire()
+    page = None
+    try:
+        page = await context.new_page()
+        _configure_page(page)
+        
+        # Navigate to the search page
+        print(f"Searching for: {business_name}")
+        print(f"Accessing: {SEARCH_URL}")
+        
+        async with _wait_quiet(page):
+            await page.goto(SEARCH_URL, wait_until='domcontentloaded')
+        
+        # Try to accept cookies if banner appears - a reused context already has them
+        if not pool.cookies_accepted(context):
             try:
-                cookie_button = scraper.page.locator("button:has-text('Accept all')")
-                if await cookie_button.count() > 0:
-                    await cookie_button.click()
-                    print("Accepted cookies")
-                    await asyncio.sleep(1)
+                # The banner renders after domcontentloaded, so give it time to show up
+                cookie_button = page.locator("button:has-text('Accept all')").first
+                await cookie_button.wait_for(state='visible', timeout=5000)
+                await cookie_button.click()
+                print("Accepted cookies")
+                await asyncio.sleep(1)
+                # Only a clicked banner yields consent cookies worth sharing with the pool
+                await pool.mark_cookies_accepted(context)
             except Exception as e:
                 print(f"No cookie banner found or could not accept cookies: {e}")
-            
-            # Wait for search box and fill it
-            search_box_selector = "#QueryString"
-            try:
-                await scraper.page.wait_for_selector(search_box_selector, timeout=10000)
-                await scraper.page.fill(search_box_selector, "")  # Clear first
-                await scraper.page.fill(search_box_selector, business_name)
-                print("Search term entered")
-            except Exception as e:
-                print(f"Error filling search box: {e}")
-                return ""
-            
-            # Try different search button selectors
-            search_button_selectors = [
-                "button[type='submit']",
-                "input[type='submit']",
-                "button:has-text('Search')",
-                "button:has-text('SEARCH')",
-                "input[value='Search']",
-                "input[value='SEARCH']",
-                "#nodeW20"  # Original ID as fallback
-            ]
-            
-            search_clicked = False
-            for selector in search_button_selectors:
-                try:
-                    button = scraper.page.locator(selector)
-                    if await button.count() > 0:
-                        await button.click()
-                        print(f"Search button clicked using {selector}")
-                        search_clicked = True
-                        break
-                except Exception as e:
-                    print(f"Tried selector {selector} but failed: {e}")
-            
-            if not search_clicked:
-                print("Could not find or click the search button")
-                return ""
-            
-            # Wait for results to load
-            print("Waiting for results...")
-            await asyncio.sleep(10)  # Give time for results to load
-            
-            # Save page source for debugging
-            page_content = await scraper.page.content()
-            if SAVE_DEBUG_FILES:
-                debug_file = get_output_path('search_results_page.html')
-                with open(debug_file, 'w', encoding='utf-8') as f:
-                    f.write(page_content)
-                print(f"Saved search results page for debugging: {debug_file}")
-            else:
-                print("Debug file saving disabled - skipping search_results_page.html")
-            
-            # Check for results
-            result_selectors = [
-                "div.registerItemSearch-results-page-line-ItemBox",
-                "div.search-results",
-                "div.result-item",
-                "div.search-result"
-            ]
-            
-            results_found = False
-            for selector in result_selectors:
-                results = scraper.page.locator(selector)
-                count = await results.count()
-                if count > 0:
-                    print(f"Found {count} results with selector: {selector}")
-                    results_found = True
-                    break
-            
-            if not results_found:
-                print("Warning: No results found with any selector")
-                # Check for "no results" message
-                no_results = scraper.page.locator("text=/No results found|No matches found/i")
-                if await no_results.count() > 0:
-                    print("No results found for the search term")
-            
-            return page_content
-            
+        
+        # Wait for search box and fill it
+        search_box_selector = "#QueryString"
+        try:
+            await page.wait_for_selector(search_box_selector, timeout=10000)
+            await page.fill(search_box_selector, "")  # Clear first
+            await page.fill(search_box_selector, business_name)
+            print("Search term entered")
         except Exception as e:
-            print(f"Unexpected error during search: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"Error filling search box: {e}")
             return ""
+        
+        # Click whichever search button variant the page has
+        try:
+            await page.locator(SEARCH_BUTTON_CSS).first.click(timeout=5000)
+            print("Search button clicked")
+        except Exception as e:
+            print(f"Could not find or click the search button: {e}")
+            return ""
+        
+        # The no-results message also marks the page as ready
+        no_results = page.locator("text=/No results found|No matches found/i")
+        
+        # Wait for results to load - returns as soon as either appears
+        print("Waiting for results...")
+        wait_failed = False
+        try:
+            await (page.locator(RESULT_CSS)
+                   .or_(no_results)
+                   .first.wait_for(state='visible', timeout=15000))
+        except Exception as e:
+            print(f"Results did not appear before timeout: {e}")
+            wait_failed = True
+        
+        # One evaluate reports both the result count and the no-results message
+        scan = await page.evaluate("window.__scanResults()")
+        count = scan['results']
+        if count:
+            print(f"Found {count} results")
+        elif scan['none']:
+            # A search with zero hits still succeeded - callers parse the page as a no-match
+            print("No results found for the search term")
+        else:
+            print("Warning: No results found with any selector")
+            if wait_failed:
+                # Neither results nor the no-results message ever appeared: skip the
+                # full DOM serialize; innerText is enough to diagnose the failure
+                if SAVE_DEBUG_FILES:
+                    body_text = await page.inner_text('body')
+                    print(f"Page text at failure: {body_text[:500]}")
+                return ""
+        
+        # Save page source for debugging
+        page_content = await page.content()
+        if SAVE_DEBUG_FILES:
+            # Write off the event loop so concurrent searches aren't stalled
+            debug_file = get_output_path('search_results_page.html')
+            async with aiofiles.open(debug_file, 'wb') as f:
+                await f.write(page_content.encode('utf-8'))
+            print(f"Saved search results page for debugging: {debug_file}")
+        else:
+            print("Debug file saving disabled - skipping search_results_page.html")
+        
+        return page_content
+        
+    except Exception as e:
+        print(f"Unexpected error during search: {e}")
+        import traceback
+        traceback.print_exc()
+        return ""
+    finally:
+        if page:
+            await page.close()
+        pool.release(context)
 
 
 # Synchronous wrapper for compatibility
@@ -583,15 +983,7 @@ def search_ontario_business_playwright(business_name: str) -> str:
     Returns:
         HTML content of the search results page
     """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            raise RuntimeError("Loop is closed")
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(search_ontario_business_async(business_name))
+    return _run_sync(search_ontario_business_async(business_name))
 
 
 class ConcurrentBusinessProcessor:
@@ -603,27 +995,57 @@ class ConcurrentBusinessProcessor:
     def __init__(self, max_concurrent: int = MAX_CONCURRENT_SEARCHES):
         self.max_concurrent = max_concurrent
         self.browser = None
+        self._ctx_pool: Optional[ContextPool] = None
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self._bucket = TokenBucket()  # caps how fast new searches hit the registry
     
     async def __aenter__(self):
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=True)
+        # Share the module-wide Chromium; only our pooled contexts are ours to close
+        self.browser = await _get_browser(headless=True)
+        self._ctx_pool = ContextPool(self.browser, self.max_concurrent)
+        await self._warm_context()
         return self
     
+    async def _warm_context(self):
+        """
+        Accept the cookie banner once up front so every pooled context
+        created afterwards starts from the accepted storage state.
+        """
+        context = await self._ctx_pool.acquire()
+        page = None
+        try:
+            page = await context.new_page()
+            await page.goto(SEARCH_URL, wait_until='domcontentloaded')
+            try:
+                await page.click("button:has-text('Accept all')", timeout=2000)
+            except Exception:
+                pass  # Cookie banner might not exist - leave the pool un-warmed
+            else:
+                # Only share the storage state once consent was actually given
+                await self._ctx_pool.mark_cookies_accepted(context)
+        except Exception as e:
+            print(f"Could not warm up browser context: {e}")
+        finally:
+            if page:
+                await page.close()
+            self._ctx_pool.release(context)
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.browser:
-            await self.browser.close()
+        if self._ctx_pool:
+            await self._ctx_pool.close()
+        self.browser = None
     
     async def _process_single_business(self, business_name: str) -> SearchResult:
         """Process a single business with context management."""
         async with self.semaphore:
+            await self._bucket.acquire()
+            
+            # Reuse a pooled context; each search still gets a fresh page
+            context = await self._ctx_pool.acquire()
+            page = None
             try:
-                # Create isolated context for this search
-                context = await self.browser.new_context(
-                    viewport={'width': 1280, 'height': 720},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
                 page = await context.new_page()
+                _configure_page(page)
                 
                 # Use optimized search method
                 scraper = PlaywrightScraper()
@@ -631,9 +1053,10 @@ class ConcurrentBusinessProcessor:
                 scraper.context = context
                 scraper.page = page
                 
-                result = await scraper.search_business_optimized(business_name)
-                
-                await context.close()
+                handle_cookies = not self._ctx_pool.cookies_accepted(context)
+                result = await scraper.search_business_optimized(business_name, handle_cookies)
+                if scraper.cookies_accepted:
+                    await self._ctx_pool.mark_cookies_accepted(context)
                 return result
                 
             except Exception as e:
@@ -642,48 +1065,45 @@ class ConcurrentBusinessProcessor:
                     business_name=business_name,
                     success=False,
                     error_message=str(e),
-                    html_content=""
+                    html_content=b""
                 )
+            finally:
+                if page:
+                    await page.close()
+                self._ctx_pool.release(context)
     
-    async def process_businesses(self, business_names: List[str], batch_size: int = 10) -> List[SearchResult]:
+    async def process_businesses(self, business_names: List[str]) -> List[SearchResult]:
         """
-        Process businesses in batches with concurrent execution.
+        Process businesses concurrently, capped at max_concurrent searches.
+        
+        All searches are scheduled up front and the semaphore in
+        _process_single_business limits how many run at once, so a slow
+        search never leaves the other slots idle.
         
         Args:
             business_names: List of business names to process
-            batch_size: Number of businesses to process concurrently
             
         Returns:
-            List of SearchResult objects
+            List of SearchResult objects, in input order
         """
-        all_results = []
+        print(f"Processing {len(business_names)} businesses "
+              f"({self.max_concurrent} at a time)")
         
-        # Process in batches to prevent overwhelming the server
-        for i in range(0, len(business_names), batch_size):
-            batch = business_names[i:i + batch_size]
-            print(f"Processing batch {i//batch_size + 1}: {len(batch)} businesses")
-            
-            # Process batch concurrently
-            tasks = [self._process_single_business(name) for name in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle any exceptions
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    error_result = SearchResult(
-                        business_name=batch[j],
-                        success=False,
-                        error_message=str(result),
-                        html_content=""
-                    )
-                    all_results.append(error_result)
-                else:
-                    all_results.append(result)
-            
-            # Pause between batches to be server-friendly
-            if i + batch_size < len(business_names):
-                print(f"Completed batch {i//batch_size + 1}. Pausing before next batch...")
-                await asyncio.sleep(2)  # 2-second pause between batches
+        tasks = [self._process_single_business(name) for name in business_names]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Handle any exceptions
+        all_results = []
+        for name, result in zip(business_names, results):
+            if isinstance(result, Exception):
+                all_results.append(SearchResult(
+                    business_name=name,
+                    success=False,
+                    error_message=str(result),
+                    html_content=b""
+                ))
+            else:
+                all_results.append(result)
         
         return all_results
 
@@ -697,8 +1117,12 @@ async def search_businesses_concurrent(business_names: List[str]) -> List[Search
     Returns:
         List of SearchResult objects with performance metrics
     """
-    async with ConcurrentBusinessProcessor() as processor:
-        return await processor.process_businesses(business_names)
+    try:
+        async with ConcurrentBusinessProcessor() as processor:
+            return await processor.process_businesses(business_names)
+    finally:
+        # Usually run under asyncio.run - don't leave Chromium behind on a dead loop
+        await close_shared_browser()
 
 # Performance testing and comparison functions
 async def compare_performance(business_names: List[str], sample_size: int = 10):
@@ -761,16 +1185,20 @@ if __name__ == "__main__":
     
     # Run performance comparison
     async def main():
-        await compare_performance(test_businesses, sample_size=3)
-        
-        # Test single optimized search
-        print(f"\n🔍 Testing single optimized search...")
-        async with PlaywrightScraper() as scraper:
-            await scraper.initialize()
-            result = await scraper.search_business_optimized("MTD Products Limited")
-            print(f"Search completed: {result.success}")
-            print(f"Time taken: {result.search_time:.2f}s")
-            print(f"Content size: {result.response_size:,} characters")
+        try:
+            await compare_performance(test_businesses, sample_size=3)
+            
+            # Test single optimized search
+            print(f"\n🔍 Testing single optimized search...")
+            async with PlaywrightScraper() as scraper:
+                await scraper.initialize()
+                result = await scraper.search_business_optimized("MTD Products Limited")
+                print(f"Search completed: {result.success}")
+                print(f"Time taken: {result.search_time:.2f}s")
+                print(f"Results found: {len(result.results or [])}")
+                print(f"Content size: {result.response_size:,} bytes")
+        finally:
+            await close_shared_browser()
     
     # Run the main function
     asyncio.run(main())
\ No newline at end of file
@@ -3,12 +3,122 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
 from webdriver_manager.chrome import ChromeDriverManager
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Dict, Optional
-import time
+import json
+import queue
 
-@dataclass
+@lru_cache(maxsize=None)
+def _chromedriver_path() -> str:
+    """Resolve (and download if needed) the chromedriver binary once per process"""
+    return ChromeDriverManager().install()
+
+# All interactive elements to detect, matched in a single querySelectorAll walk
+INPUT_FIELD_SELECTOR = ', '.join([
+    'input',
+    'textarea',
+    'select',
+    'button',
+    'a[href]',
+    'div[role="button"]',
+    'div[role="textbox"]',
+    'div[contenteditable="true"]',
+    'div[role="combobox"]',
+    'div[role="search"]',
+    'div[role="slider"]',
+    'div[role="spinbutton"]'
+])
+
+# Iterative xpath builder: climbs parentElement and counts same-tag element
+# siblings, stopping at the first ancestor with an id
+XPATH_JS = """
+function xpathOf(el) {
+    const parts = [];
+    while (el && el !== document.body && el !== document.documentElement) {
+        if (el.id) {
+            parts.unshift(`//*[@id="${el.id}"]`);
+            return parts.join('/');
+        }
+        let ix = 1;
+        for (let s = el.previousElementSibling; s; s = s.previousElementSibling) {
+            if (s.tagName === el.tagName) ix++;
+        }
+        parts.unshift(`${el.tagName.toLowerCase()}[${ix}]`);
+        el = el.parentElement;
+    }
+    parts.unshift('/html/body');
+    return parts.join('/');
+}
+"""
+
+# URL patterns blocked with CDP Network.setBlockedURLs when minimal_assets is set
+BLOCKED_ASSET_URLS = ['*.css', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+
+# Elements handled per detection script call, keeps each response message bounded
+DETECT_CHUNK_SIZE = 500
+
+# Takes one static snapshot of the union selector's matches for the chunked
+# passes below, and reports whether the current context is the top window
+SNAPSHOT_MATCHES_JS = """
+window.__inputFieldMatches = document.querySelectorAll(arguments[0]);
+return [window === window.top, window.__inputFieldMatches.length];
+"""
+
+# Runs the whole detection pass inside the page for snapshot entries [start, end):
+# drops hidden/disabled/anonymous elements and returns rows shaped like InputField.
+# The last chunk releases the snapshot
+DETECT_FIELDS_JS = XPATH_JS + """
+const rows = [];
+const matches = window.__inputFieldMatches || [];
+const end = Math.min(arguments[1], matches.length);
+for (let i = arguments[0]; i < end; i++) {
+    const el = matches[i];
+    // Anonymous elements are dropped before any layout or style work
+    const id = el.getAttribute('id') || 'N/A';
+    const name = el.getAttribute('name') || el.getAttribute('id') || 'N/A';
+    if (name === 'N/A' && id === 'N/A') continue;
+    
+    if (el.disabled || el.getClientRects().length === 0) continue;
+    const style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden') continue;
+    
+    const rect = el.getBoundingClientRect();
+    const attributes = {};
+    for (const attr of el.attributes) attributes[attr.name] = attr.value;
+    attributes['position'] = `x:${Math.round(rect.left + window.scrollX)}, y:${Math.round(rect.top + window.scrollY)}`;
+    attributes['size'] = `width:${Math.round(rect.width)}, height:${Math.round(rect.height)}`;
+    
+    const value = el.value === undefined ? el.getAttribute('value') : String(el.value);
+    rows.push({
+        element_type: el.tagName === 'INPUT' ? el.type : el.tagName.toLowerCase(),
+        name: name,
+        id: id,
+        xpath: xpathOf(el),
+        value: (value || (el.textContent || '').trim()).slice(0, 100),
+        placeholder: el.getAttribute('placeholder') || 'N/A',
+        is_visible: true,
+        is_enabled: true,
+        attributes_json: JSON.stringify(attributes)
+    });
+}
+if (end >= matches.length) delete window.__inputFieldMatches;
+return rows;
+"""
+
+# Conditions whose resolved element is cached by WebScraper._resolve, mapped to
+# the check a cached element must still pass before it is reused
+_CACHED_CONDITIONS = {
+    EC.element_to_be_clickable: lambda el: el.is_displayed() and el.is_enabled(),
+    EC.visibility_of_element_located: lambda el: el.is_displayed(),
+}
+
+
+@dataclass(slots=True)
 class InputField:
     element_type: str
     name: str
@@ -18,166 +128,168 @@ class InputField:
     placeholder: str
     is_visible: bool
     is_enabled: bool
-    attributes: Dict[str, str]
+    attributes_json: str = '{}'  # Raw attribute blob from the page, decoded on first access
+    _attributes: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def attributes(self) -> Dict[str, str]:
+        if self._attributes is None:
+            self._attributes = json.loads(self.attributes_json or '{}')
+        return self._attributes
 
 class WebScraper:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, driver_path: Optional[str] = None, poll: float = 0.1,
+                 minimal_assets: bool = False):
         """
         Initialize the web scraper with Chrome WebDriver
         
         Args:
             headless: Run browser in headless mode (no GUI)
+            driver_path: Explicit chromedriver binary; defaults to the process-wide ChromeDriverManager install
+            poll: Seconds between WebDriverWait condition checks; raise on slow machines
+            minimal_assets: Block images, stylesheets and fonts (the latter two via CDP); without CSS, visibility detection may differ
         """
         self.options = webdriver.ChromeOptions()
+        # Return from driver.get() at DOMContentLoaded; detection only needs the DOM
+        self.options.page_load_strategy = 'eager'
         if headless:
             self.options.add_argument('--headless')
+            self.options.add_argument('--disable-gpu')
+            self.options.add_argument('--blink-settings=imagesEnabled=false')
+        self.options.add_argument('--disable-extensions')
+        if minimal_assets:
+            # Chrome only has a content setting for images; CSS and fonts are blocked over CDP below
+            self.options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2
+            })
         self.options.add_argument('--no-sandbox')
         self.options.add_argument('--disable-dev-shm-usage')
         
         self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(driver_path or _chromedriver_path()),
             options=self.options
         )
-        self.wait = WebDriverWait(self.driver, 10)
+        self.wait = WebDriverWait(self.driver, 10, poll_frequency=poll)
+        # (locator strategy, locator value, condition) -> resolved element, reset on navigation
+        self._element_cache: Dict[tuple, WebElement] = {}
+        # Cleared the first time a CDP command fails (non-Chromium driver)
+        self._use_cdp = hasattr(self.driver, 'execute_cdp_cmd')
+        if minimal_assets:
+            self._block_asset_urls()
     
-    def get_page(self, url: str) -> None:
-        """Navigate to the specified URL"""
+    def _block_asset_urls(self) -> None:
+        """Block stylesheet and font downloads through CDP (Chromium only)"""
+        if not self._use_cdp:
+            print("Warning: CDP unavailable, stylesheets and fonts will still load")
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_ASSET_URLS})
+        except WebDriverException as e:
+            print(f"Warning: could not block stylesheets and fonts: {str(e)}")
+    
+    def get_page(self, url: str, ready_selector: Optional[str] = None) -> None:
+        """
+        Navigate to the specified URL and wait until the DOM has been parsed.
+        Subresources may still be loading; pass ready_selector for content that
+        is rendered by scripts after load.
+
+        Args:
+            url: URL to load
+            ready_selector: Optional CSS selector that must be present before returning
+        """
+        self._element_cache.clear()
         self.driver.get(url)
-        time.sleep(2)  # Allow time for dynamic content to load
+        try:
+            self.wait.until(lambda d: d.execute_script("return document.readyState") != "loading")
+            if ready_selector:
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+        except TimeoutException:
+            print("Warning: Page load not complete, continuing anyway...")
     
     def detect_input_fields(self) -> List[InputField]:
         """
         Enhanced detection of all interactive elements on the current page.
         Returns a list of InputField objects containing detailed field information.
         """
-        input_fields = []
-        
-        # Wait for the page to be fully loaded
+        rows = []
         try:
-            self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        except:
-            print("Warning: Page load not complete, continuing anyway...")
-        
-        # Define all possible interactive elements to detect
-        element_selectors = [
-            ('input', 'input'),
-            ('textarea', 'textarea'),
-            ('select', 'select'),
-            ('button', 'button'),
-            ('a', 'a[href]'),
-            ('div', 'div[role="button"]'),
-            ('div', 'div[role="textbox"]'),
-            ('div', 'div[contenteditable="true"]'),
-            ('div', 'div[role="combobox"]'),
-            ('div', 'div[role="search"]'),
-            ('div', 'div[role="slider"]'),
-            ('div', 'div[role="spinbutton"]')
-        ]
+            # The document is walked once; each chunk slices the same snapshot so
+            # DOM changes between calls can't shift indices. execute_script honours
+            # switch_to.frame; CDP always targets the top document, so it is only
+            # used when no frame is selected
+            in_top_frame, total = self.driver.execute_script(SNAPSHOT_MATCHES_JS, INPUT_FIELD_SELECTOR)
+            for start in range(0, total, DETECT_CHUNK_SIZE):
+                rows.extend(self._evaluate(
+                    DETECT_FIELDS_JS, start, start + DETECT_CHUNK_SIZE, use_cdp=in_top_frame
+                ) or [])
+        except Exception as e:
+            print(f"Error detecting input fields: {str(e)}")
+            return []
         
-        for tag, selector in element_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"Found {len(elements)} elements matching: {selector}")
-                
-                for element in elements:
-                    try:
-                        # Skip elements that are not visible or not enabled
-                        if not element.is_displayed() or not element.is_enabled():
-                            continue
-                            
-                        # Get element properties safely
-                        element_type = element.get_attribute('type') or tag
-                        name = element.get_attribute('name') or element.get_attribute('id') or 'N/A'
-                        element_id = element.get_attribute('id') or 'N/A'
-                        value = element.get_attribute('value') or element.text or ''
-                        placeholder = element.get_attribute('placeholder') or 'N/A'
-                        
-                        # Get all attributes
-                        attributes = {}
-                        try:
-                            attrs = self.driver.execute_script(
-                                "var items = {}; " +
-                                "for (index = 0; index < arguments[0].attributes.length; ++index) { " +
-                                "  items[arguments[0].attributes[index].name] = arguments[0].attributes[index].value " +
-                                "} " +
-                                "return items;", 
-                                element
-                            )
-                            attributes = attrs if attrs else {}
-                        except:
-                            pass
-                        
-                        # Get computed styles to check for visibility
-                        try:
-                            computed_style = self.driver.execute_script(
-                                "return window.getComputedStyle(arguments[0])", 
-                                element
-                            )
-                            if computed_style.getPropertyValue('display') == 'none' or \
-                               computed_style.getPropertyValue('visibility') == 'hidden':
-                                continue
-                        except:
-                            pass
-                        
-                        # Get element position and size
-                        try:
-                            location = element.location
-                            size = element.size
-                            attributes['position'] = f"x:{location['x']}, y:{location['y']}"
-                            attributes['size'] = f"width:{size['width']}, height:{size['height']}"
-                        except:
-                            pass
-                        
-                        input_field = InputField(
-                            element_type=element_type,
-                            name=name,
-                            id=element_id,
-                            xpath=self._get_element_xpath(element),
-                            value=value[:100],  # Limit value length
-                            placeholder=placeholder,
-                            is_visible=element.is_displayed(),
-                            is_enabled=element.is_enabled(),
-                            attributes=attributes
-                        )
-                        
-                        # Only add if we have enough identifying information
-                        if input_field.name != 'N/A' or input_field.id != 'N/A':
-                            input_fields.append(input_field)
-                            
-                    except Exception as e:
-                        print(f"Error processing element: {str(e)}")
-                        continue
-                        
-            except Exception as e:
-                print(f"Error finding elements with selector {selector}: {str(e)}")
-                continue
-                
+        input_fields = [InputField(**row) for row in rows]
         print(f"Total input fields detected: {len(input_fields)}")
         return input_fields
     
-    def _get_element_xpath(self, element) -> str:
-        """Generate XPath for the given element"""
-        return self.driver.execute_script("""
-        function getElementXPath(element) {
-            if (!element) return '';
-            if (element.id) return `//*[@id="${element.id}"]`;
-            if (element === document.body) return '/html/body';
+    def _evaluate(self, script: str, *args, use_cdp: bool = True):
+        """
+        Run a script body with JSON-serialisable arguments and return its value.
+        Uses CDP Runtime.evaluate on Chromium, skipping the WebDriver script
+        endpoint, and falls back to execute_script for other drivers. Runtime.evaluate
+        ignores driver.switch_to.frame, so pass use_cdp=False while a frame is selected.
+        """
+        if use_cdp and self._use_cdp:
+            expression = f"(function () {{{script}}}).apply(null, {json.dumps(args)})"
+            try:
+                response = self.driver.execute_cdp_cmd(
+                    'Runtime.evaluate', {'expression': expression, 'returnByValue': True}
+                )
+                if 'exceptionDetails' not in response:
+                    return response['result'].get('value')
+                details = response['exceptionDetails']
+                error = details.get('exception', {}).get('description') or details.get('text')
+                print(f"Warning: CDP evaluation failed ({error}), retrying with execute_script")
+            except (AttributeError, WebDriverException) as e:
+                print(f"Warning: CDP unavailable ({str(e)}), using execute_script")
+                self._use_cdp = False
+        return self.driver.execute_script(script, *args)
+    
+    def _resolve(self, by: str, value: str, condition) -> WebElement:
+        """
+        Return the element for a locator, reusing the cached one while it still
+        satisfies the condition
+        
+        Args:
+            by: Locator strategy (a By constant)
+            value: Locator value
+            condition: Expected condition factory used when the element has to be looked up
             
-            let ix = 0;
-            const siblings = element.parentNode.childNodes;
-            for (let i = 0; i < siblings.length; i++) {
-                const sibling = siblings[i];
-                if (sibling === element) {
-                    return `${getElementXPath(element.parentNode)}/${element.tagName.toLowerCase()}[${ix + 1}]`;
-                }
-                if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
-                    ix++;
-                }
-            }
-            return '';
-        }
-        return getElementXPath(arguments[0]);
-        """, element)
+        Returns:
+            WebElement: The resolved element
+        """
+        recheck = _CACHED_CONDITIONS.get(condition)
+        if recheck is None:
+            # Presence lookups gain nothing from the cache: probing a cached
+            # element costs the same round-trip as a fresh find_element
+            return self.wait.until(condition((by, value)))
+        
+        # The condition is part of the key: an element found as visible must
+        # still be waited on before it is handed out as clickable
+        key = (by, value, condition)
+        element = self._element_cache.get(key)
+        if element is not None:
+            try:
+                # Re-check the condition on the cached node; a detached, hidden
+                # or disabled element goes back through the full wait instead
+                if recheck(element):
+                    return element
+            except StaleElementReferenceException:
+                pass
+            del self._element_cache[key]
+        
+        element = self.wait.until(condition((by, value)))
+        self._element_cache[key] = element
+        return element
     
     def fill_form(self, field_xpath: str, value: str) -> bool:
         """
@@ -191,9 +303,7 @@ class WebScraper:
             bool: True if successful, False otherwise
         """
         try:
-            element = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, field_xpath))
-            )
+            element = self._resolve(By.XPATH, field_xpath, EC.presence_of_element_located)
             element.clear()
             element.send_keys(value)
             return True
@@ -212,9 +322,7 @@ class WebScraper:
             bool: True if successful, False otherwise
         """
         try:
-            element = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, xpath))
-            )
+            element = self._resolve(By.XPATH, xpath, EC.element_to_be_clickable)
             element.click()
             return True
         except Exception as e:
@@ -240,9 +348,7 @@ class WebScraper:
         """
         try:
             # Wait for the element to be present and visible
-            element = self.wait.until(
-                EC.visibility_of_element_located((By.ID, element_id))
-            )
+            element = self._resolve(By.ID, element_id, EC.visibility_of_element_located)
             
             # Scroll the element into view
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
@@ -270,61 +376,109 @@ class WebScraper:
         """Close the browser"""
         self.driver.quit()
 
+def scrape_many(urls: List[str], workers: int = 4, headless: bool = True) -> List[List[InputField]]:
+    """
+    Detect input fields on several pages in parallel, reusing one browser per worker
+    
+    Args:
+        urls: Pages to scrape
+        workers: Number of browsers to run side by side
+        headless: Run the browsers in headless mode
+        
+    Returns:
+        List[List[InputField]]: Detected fields for each URL, in input order
+    """
+    if not urls:
+        return []
+    workers = max(1, min(workers, len(urls)))
+    driver_path = _chromedriver_path()  # Resolve before the workers start so they don't race the install
+    pool: "queue.Queue[WebScraper]" = queue.Queue()
+    
+    def scrape_one(url: str) -> List[InputField]:
+        scraper = pool.get()
+        try:
+            scraper.get_page(url)
+            return scraper.detect_input_fields()
+        except Exception as e:
+            print(f"Error scraping {url}: {str(e)}")
+            return []
+        finally:
+            pool.put(scraper)
+    
+    scrapers: List[WebScraper] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            startups = [executor.submit(WebScraper, headless=headless, driver_path=driver_path)
+                        for _ in range(workers)]
+            # Keep every browser that did start so it gets closed even if another failed
+            errors = []
+            for startup in startups:
+                try:
+                    scrapers.append(startup.result())
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+            
+            for scraper in scrapers:
+                pool.put(scraper)
+            return list(executor.map(scrape_one, urls))
+        finally:
+            for scraper in scrapers:
+                scraper.close()
+
 def main():
     # Example usage
-    url = input("Enter the URL to scrape: ")
-    
-    # Initialize the scraper
-    scraper = WebScraper(headless=False)  # Set to True for headless mode
+    raw_urls = input("Enter the URL(s) to scrape (comma-separated): ")
+    urls = [url.strip() for url in raw_urls.split(',') if url.strip()]
     
     try:
-        # Navigate to the page
-        print(f"Navigating to {url}...")
-        scraper.get_page(url)
-        
-        # Detect input fields
-        print("\nDetecting input fields...")
-        input_fields = scraper.detect_input_fields()
+        # Navigate to each page and detect input fields, one browser per worker
+        print(f"Scraping {len(urls)} page(s)...")
+        results = scrape_many(urls, headless=False)  # Set to True for headless mode
         
-        # Print the results
-        print(f"\nFound {len(input_fields)} input fields:")
-        print("-" * 80)
-        
-        for i, field in enumerate(input_fields, 1):
-            print(f"{i}. Type: {field.element_type}")
-            print(f"   Name: {field.name}")
-            print(f"   ID: {field.id}")
-            print(f"   XPath: {field.xpath}")
-            print(f"   Value: {field.value}")
-            print(f"   Placeholder: {field.placeholder}")
-            print(f"   Visible: {field.is_visible}")
-            print(f"   Enabled: {field.is_enabled}")
+        report_lines = []
+        append = report_lines.append
+        for url, input_fields in zip(urls, results):
+            # Print the results
+            print(f"\nFound {len(input_fields)} input fields on {url}:")
             print("-" * 80)
-        
-        # Save results to a file
-        with open('input_fields_report.txt', 'w', encoding='utf-8') as f:
-            f.write(f"Input Fields Report for {url}\n")
-            f.write("=" * 50 + "\n\n")
             
             for i, field in enumerate(input_fields, 1):
-                f.write(f"{i}. Type: {field.element_type}\n")
-                f.write(f"   Name: {field.name}\n")
-                f.write(f"   ID: {field.id}\n")
-                f.write(f"   XPath: {field.xpath}\n")
-                f.write(f"   Value: {field.value}\n")
-                f.write(f"   Placeholder: {field.placeholder}\n")
-                f.write(f"   Visible: {field.is_visible}\n")
-                f.write(f"   Enabled: {field.is_enabled}\n")
-                f.write(f"   Attributes: {field.attributes}\n")
-                f.write("-" * 50 + "\n\n")
+                print(f"{i}. Type: {field.element_type}")
+                print(f"   Name: {field.name}")
+                print(f"   ID: {field.id}")
+                print(f"   XPath: {field.xpath}")
+                print(f"   Value: {field.value}")
+                print(f"   Placeholder: {field.placeholder}")
+                print(f"   Visible: {field.is_visible}")
+                print(f"   Enabled: {field.is_enabled}")
+                print("-" * 80)
+            
+            append(f"Input Fields Report for {url}\n")
+            append("=" * 50 + "\n\n")
             
-            print("\nReport saved to 'input_fields_report.txt'")
+            for i, field in enumerate(input_fields, 1):
+                append(
+                    f"{i}. Type: {field.element_type}\n"
+                    f"   Name: {field.name}\n"
+                    f"   ID: {field.id}\n"
+                    f"   XPath: {field.xpath}\n"
+                    f"   Value: {field.value}\n"
+                    f"   Placeholder: {field.placeholder}\n"
+                    f"   Visible: {field.is_visible}\n"
+                    f"   Enabled: {field.is_enabled}\n"
+                    f"   Attributes: {field.attributes}\n"
+                    + "-" * 50 + "\n\n"
+                )
+        
+        # Save results to a file in a single write
+        with open('input_fields_report.txt', 'w', encoding='utf-8') as f:
+            f.write("".join(report_lines))
+        print("\nReport saved to 'input_fields_report.txt'")
         
     except Exception as e:
         print(f"An error occurred: {str(e)}")
-    finally:
-        # Close the browser
-        scraper.close()
 
 if __name__ == "__main__":
     main()